@@ -16,17 +16,206 @@ The script will:
 6. Generate verification reports
 """
 
+import argparse
+import functools
+import hashlib
 import json
+import re
 import sys
 import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import DecodeError, HTTPError, ProtocolError
+from urllib3.util.retry import Retry
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import ijson
+    # The pure-Python backends are much slower than json.loads; only stream
+    # responses when ijson's C backend (yajl2_c) is available
+    if getattr(ijson, 'backend', None) != 'yajl2_c':
+        ijson = None
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@functools.lru_cache(maxsize=8192)
+def _norm(s):
+    """Normalize string for comparison"""
+    if not s or not isinstance(s, str):
+        return ""
+    return s.strip().lower()
+
+
+def _loads(data):
+    """Decode JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj):
+    """Encode an object as compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _load_json(response):
+    """
+    Decode the JSON body of a streamed response.
+    
+    orjson is preferred when installed: decoding the buffered body is fastest.
+    Otherwise, with ijson's C backend available, the body is parsed as it
+    arrives so the raw bytes are never held alongside the decoded objects.
+    Failing both, the buffered body is decoded with the stdlib json module.
+    """
+    if orjson is not None or ijson is None:
+        return _loads(response.content)
+    
+    # Reading response.raw bypasses requests' own exception wrapping, so map
+    # urllib3 errors the same way Response.iter_content does
+    response.raw.decode_content = True
+    try:
+        return next(ijson.items(response.raw, '', use_float=True))
+    except ijson.JSONError as e:
+        raise json.JSONDecodeError(str(e), '', 0) from e
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e) from e
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e) from e
+    except HTTPError as e:
+        # Includes ReadTimeoutError
+        raise requests.exceptions.ConnectionError(e) from e
+
+
+class _SetEncoder(json.JSONEncoder):
+    """JSON encoder that writes sets as sorted lists"""
+    
+    def default(self, o):
+        if isinstance(o, (set, frozenset)):
+            return sorted(o)
+        return super().default(o)
+
+
+def _format_age(seconds):
+    """Format a cache entry's age for log output (e.g. "45m", "3h")"""
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m"
+    return f"{int(seconds // 3600)}h"
+
+
+def _disk_cache(ttl_hours=24):
+    """
+    Cache a method's parsed JSON result on disk, keyed by URL.
+    
+    The wrapped method is called as func(self, url, *args, headers=...) and must
+    return (data, response_headers), with data None when the server answers
+    304 Not Modified; the wrapper itself returns just the data. Entries live in
+    the instance's cache_dir and are reused without a request until they are
+    older than ttl_hours. Older entries are revalidated with the stored
+    ETag/Last-Modified, so an unchanged response is not downloaded again.
+    When the instance's use_cache is False, cached entries are ignored but the
+    fresh response is still written, replacing any stale entry. Whenever cached
+    data is returned, a note saying so is stored in the instance's cache_notes
+    under the URL for the caller to log.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, url, *args, **kwargs):
+            key = hashlib.sha1(url.encode()).hexdigest()
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            meta_path = os.path.join(self.cache_dir, f"{key}.meta.json")
+            cached = None
+            if self.use_cache:
+                try:
+                    with open(path, 'rb') as f:
+                        cached = _loads(f.read())
+                    age = time.time() - os.path.getmtime(path)
+                except (OSError, ValueError):
+                    # Missing, unreadable or corrupt entry - fetch again
+                    cached = None
+            
+            headers = {}
+            if cached is not None:
+                if age < ttl_hours * 3600:
+                    self.cache_notes[url] = f"cached, {_format_age(age)} old"
+                    return cached
+                try:
+                    with open(meta_path, 'rb') as f:
+                        meta = _loads(f.read())
+                    if meta.get('etag'):
+                        headers['If-None-Match'] = meta['etag']
+                    if meta.get('last_modified'):
+                        headers['If-Modified-Since'] = meta['last_modified']
+                except (OSError, ValueError, AttributeError):
+                    pass
+            
+            data, response_headers = func(self, url, *args, headers=headers, **kwargs)
+            if data is None:
+                # Not modified - keep the cached copy and restart its TTL
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self.cache_notes[url] = f"cached, {_format_age(age)} old, unchanged on server"
+                return cached
+            
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(_dumps(data))
+                with open(meta_path, 'wb') as f:
+                    f.write(_dumps({
+                        'etag': response_headers.get('ETag'),
+                        'last_modified': response_headers.get('Last-Modified'),
+                    }))
+            except (OSError, TypeError):
+                # The cache is best-effort; a read-only home must not fail the run
+                pass
+            return data
+        return wrapper
+    return decorator
 
 
 class OSDRFilterGenerator:
-    def __init__(self):
+    # Keys a response must contain to be accepted (and cached)
+    FILTER_OPTIONS_KEYS = ('study',)
+    API_DATA_KEYS = ('columns', 'data')
+    
+    # Separator for entries that list several missions
+    _MISSION_SPLIT = re.compile(r'\s*,\s*')
+    
+    # Mission categories in priority order; the first matching pattern wins
+    _MISSION_RULES = [
+        ('ISS Expeditions', re.compile(r'expedition|increment|iss', re.IGNORECASE)),
+        ('Space Shuttle', re.compile(r'sts[- ]|shuttle|sls-', re.IGNORECASE)),
+        ('Rodent Research', re.compile(r'(?-i:^RR-)|rodent research', re.IGNORECASE)),
+        ('Bion/Cosmos', re.compile(r'bion|cosmos', re.IGNORECASE)),
+        ('Payload Investigations', re.compile(r'bric-|apex-|veg-|ffl|cbtm|cerise', re.IGNORECASE)),
+        ('Ground Control', re.compile(r'ground|bsl|baseline', re.IGNORECASE)),
+        ('Radiation Studies', re.compile(r'gamma_irradiation|heavy_ion|hze|proton_irradiation|'
+                                         r'x-ray_irradiation|irradiation|radiation', re.IGNORECASE)),
+        ('Simulated Conditions', re.compile(r'hindlimb_unloading|simulated_microgravity|'
+                                            r'simulated_hypergravity|simulated_environmental', re.IGNORECASE)),
+        ('Commercial Spaceflight', re.compile(r'inspiration4|axiom|ax-|spacex', re.IGNORECASE)),
+    ]
+    
+    def __init__(self, use_cache=True, cache_dir=None):
         """
         Initialize generator and download current filter-options from OSDR.
+        
+        Args:
+            use_cache: Reuse API responses downloaded within the last 24 hours;
+                when False, everything is downloaded again and the cache refreshed
+            cache_dir: Directory for cached responses (default: ~/.cache/osdr_filter)
         """
         print("="*80)
         print("NASA OSDR Dashboard JSON Generator (Real-time API)")
@@ -36,39 +225,113 @@ class OSDRFilterGenerator:
         self.base_url = "https://visualization.osdr.nasa.gov/biodata/api/v2"
         self.filter_options_url = "https://osdr.nasa.gov/geode-py/ws/repo/filter-options"
         self.session = requests.Session()
+        # Keep enough pooled connections for every parallel request to reuse
+        # its connection, and retry connection failures and transient server
+        # errors with backoff. Read timeouts are not retried (read=0), so a
+        # hung endpoint still fails after a single timeout.
+        retries = Retry(total=3, read=0, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504))
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+        self.session.headers.update({'Accept': 'application/json'})
+        self.use_cache = use_cache
+        self.cache_notes = {}
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.cache', 'osdr_filter')
+        self.endpoints = {
+            'assay': "?investigation.study%20assays.study%20assay%20technology%20type=//&format=json.split",
+            'factor': "?investigation.study%20assays.study%20assay%20technology%20type&assay.factor%20value&study.factor%20value&schema&format=json.split",
+            'organism': "?investigation.study%20assays.study%20assay%20technology%20type=//&study.characteristics.organism=//&format=json.split",
+            'material': "?investigation.study%20assays.study%20assay%20technology%20type=//&study.characteristics.material%20type=//&format=json.split",
+            'mission': "?investigation.study%20assays.study%20assay%20technology%20type=//&investigation.study.comment.Project%20Identifier=//&format=json.split",
+        }
         
-        # Download current filter-options JSON
-        print(f"\nDownloading current filter-options from OSDR...")
-        print(f"  URL: {self.filter_options_url}")
-        self.current_json = self.download_current_json()
-        
-        # Fetch API data
-        print("\nFetching data from OSDR API...")
-        self.assay_data = self.fetch_assay_data()
-        self.factor_data = self.fetch_factor_data()
-        self.organism_data = self.fetch_organism_data()
-        self.material_data = self.fetch_material_data()
-        self.mission_data = self.fetch_mission_data()
+        # Issue all downloads at once; the calls below wait on the
+        # in-flight requests in order so the log output stays sequential
+        requests_to_make = [(self.filter_options_url, 30, self.FILTER_OPTIONS_KEYS)]
+        requests_to_make += [
+            (self.api_url(endpoint), 60, self.API_DATA_KEYS) for endpoint in self.endpoints.values()
+        ]
+        with ThreadPoolExecutor(max_workers=len(requests_to_make)) as pool:
+            self._prefetched = {
+                url: pool.submit(self._request_json, url, timeout, required_keys)
+                for url, timeout, required_keys in requests_to_make
+            }
+            
+            # Download current filter-options JSON
+            print(f"\nDownloading current filter-options from OSDR...")
+            print(f"  URL: {self.filter_options_url}")
+            self.current_json = self.download_current_json()
+            
+            # Fetch API data
+            print("\nFetching data from OSDR API...")
+            self.assay_data = self.fetch_assay_data()
+            self.factor_data = self.fetch_factor_data()
+            self.organism_data = self.fetch_organism_data()
+            self.material_data = self.fetch_material_data()
+            self.mission_data = self.fetch_mission_data()
         
         # Extract existing structure - PRESERVE EVERYTHING
-        self.existing_structure = self.extract_existing_structure()
+        existing_structure = self.extract_existing_structure()
+        self._value_to_category = self.build_value_index(existing_structure)
+        self._original_norm_by_group = {
+            grouping: frozenset(index) for grouping, index in self._value_to_category.items()
+        }
         
-        # Build new JSON starting from existing
-        self.new_json = self.initialize_from_existing()
+        # Build new JSON starting from existing; it takes ownership of the
+        # extracted value sets, so the frozensets above are the original snapshot
+        self.new_json = self.initialize_from_existing(existing_structure)
         
         # Tracking
-        self.additions = []
-        self.unmapped = []
+        # additions: grouping -> category -> [value]
+        # unmapped: grouping -> value -> [OSD ID]
+        self.additions = defaultdict(lambda: defaultdict(list))
+        self.unmapped = defaultdict(dict)
         self.all_osd_ids = set()
     
+    def api_url(self, endpoint):
+        """Build the full OSDR API query URL for an endpoint"""
+        return f"{self.base_url}/query/assays/{endpoint}"
+    
+    @_disk_cache(ttl_hours=24)
+    def _request_json(self, url, timeout, required_keys=(), headers=None):
+        """
+        GET a URL and return (decoded JSON body, response headers). The body is
+        None when a conditional request gets 304 Not Modified.
+        
+        The body must be a JSON object containing required_keys; it is checked
+        here so that a malformed response is never written to the disk cache.
+        """
+        response = self.session.get(url, timeout=timeout, headers=headers, stream=True)
+        try:
+            if response.status_code == 304:
+                return None, response.headers
+            response.raise_for_status()
+            data = _load_json(response)
+        finally:
+            response.close()
+        
+        if not isinstance(data, dict) or any(key not in data for key in required_keys):
+            raise ValueError(f"Unexpected response format from {url}")
+        return data, response.headers
+    
+    def cache_note(self, url):
+        """Log suffix saying whether a URL's data came from the disk cache"""
+        note = self.cache_notes.get(url)
+        return f" ({note})" if note else ""
+    
+    def get_json(self, url, timeout, required_keys=()):
+        """
+        Return the JSON body for a URL, using the prefetched request if one is
+        in flight, otherwise fetching it now.
+        """
+        future = self._prefetched.pop(url, None)
+        if future is not None:
+            return future.result()
+        return self._request_json(url, timeout, required_keys)
+    
     def download_current_json(self):
         """Download current filter-options JSON from OSDR"""
         try:
-            response = self.session.get(self.filter_options_url, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            print(f"  ✓ Successfully downloaded current filter-options")
+            data = self.get_json(self.filter_options_url, 30, self.FILTER_OPTIONS_KEYS)
+            print(f"  ✓ Successfully downloaded current filter-options{self.cache_note(self.filter_options_url)}")
             return data
             
         except requests.exceptions.RequestException as e:
@@ -89,21 +352,25 @@ class OSDRFilterGenerator:
         Returns:
             dict: JSON response with 'columns' and 'data' keys
         """
-        url = f"{self.base_url}/query/assays/{endpoint}"
+        url = self.api_url(endpoint)
         print(f"  Fetching {description}...")
         print(f"    URL: {url}")
         
         try:
-            response = self.session.get(url, timeout=60)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.get_json(url, 60, self.API_DATA_KEYS)
             
             # Validate response format
             if not isinstance(data, dict) or 'columns' not in data or 'data' not in data:
                 raise ValueError(f"Unexpected API response format for {description}")
             
-            print(f"    ✓ Received {len(data['columns'])} columns, {len(data['data'])} rows")
+            # Intern strings so values repeated across rows share one object
+            data['columns'] = [sys.intern(col) for col in data['columns']]
+            data['data'] = [
+                [sys.intern(cell) if isinstance(cell, str) else cell for cell in row]
+                for row in data['data']
+            ]
+            
+            print(f"    ✓ Received {len(data['columns'])} columns, {len(data['data'])} rows{self.cache_note(url)}")
             return data
             
         except requests.exceptions.RequestException as e:
@@ -116,44 +383,38 @@ class OSDRFilterGenerator:
     def fetch_assay_data(self):
         """Fetch assay technology type data from API"""
         return self.fetch_api_data(
-            "?investigation.study%20assays.study%20assay%20technology%20type=//&format=json.split",
+            self.endpoints['assay'],
             "Assay Technology Types"
         )
     
     def fetch_factor_data(self):
         """Fetch factor data from API"""
         return self.fetch_api_data(
-            "?investigation.study%20assays.study%20assay%20technology%20type&assay.factor%20value&study.factor%20value&schema&format=json.split",
+            self.endpoints['factor'],
             "Factors"
         )
     
     def fetch_organism_data(self):
         """Fetch organism data from API"""
         return self.fetch_api_data(
-            "?investigation.study%20assays.study%20assay%20technology%20type=//&study.characteristics.organism=//&format=json.split",
+            self.endpoints['organism'],
             "Organisms"
         )
     
     def fetch_material_data(self):
         """Fetch material type data from API"""
         return self.fetch_api_data(
-            "?investigation.study%20assays.study%20assay%20technology%20type=//&study.characteristics.material%20type=//&format=json.split",
+            self.endpoints['material'],
             "Material Types"
         )
     
     def fetch_mission_data(self):
         """Fetch mission/project identifier data from API"""
         return self.fetch_api_data(
-            "?investigation.study%20assays.study%20assay%20technology%20type=//&investigation.study.comment.Project%20Identifier=//&format=json.split",
+            self.endpoints['mission'],
             "Missions"
         )
     
-    def norm(self, s):
-        """Normalize string for comparison"""
-        if not s or not isinstance(s, str):
-            return ""
-        return s.strip().lower()
-    
     def extract_existing_structure(self):
         """Extract complete existing structure preserving everything"""
         print("\nExtracting existing structure from current JSON...")
@@ -188,32 +449,22 @@ class OSDRFilterGenerator:
             if not grouping:
                 continue
             
-            # Process children - store complete hierarchy
-            for child in item.get('children', []):
-                category = child.get('displayValue', child.get('values', [''])[0] if child.get('values') else '')
+            # Process children - store complete hierarchy at any depth, keying
+            # nested categories by their '|'-joined path (depth-first, in order)
+            stack = [(child, ()) for child in reversed(item.get('children', []))]
+            while stack:
+                node, parent_path = stack.pop()
+                category = node.get('displayValue', node.get('values', [''])[0] if node.get('values') else '')
                 
-                if not category:
+                if not category and not parent_path:
                     category = 'Uncategorized'
                 
-                if category not in structure[grouping]:
-                    structure[grouping][category] = set()
-                
-                # Add all child values
-                for val in child.get('values', []):
-                    if val:
-                        structure[grouping][category].add(val)
-                
-                # Handle nested children
-                for subchild in child.get('children', []):
-                    subcategory = subchild.get('displayValue', subchild.get('values', [''])[0] if subchild.get('values') else '')
-                    full_category = f"{category}|{subcategory}"
-                    
-                    if full_category not in structure[grouping]:
-                        structure[grouping][full_category] = set()
-                    
-                    for val in subchild.get('values', []):
-                        if val:
-                            structure[grouping][full_category].add(val)
+                # str() keeps keys such as 'Mammals|None' for a null displayValue
+                path = parent_path + (str(category),)
+                structure[grouping].setdefault('|'.join(path), set()).update(
+                    val for val in node.get('values', []) if val
+                )
+                stack.extend((subchild, path) for subchild in reversed(node.get('children', [])))
         
         # Print summary
         for grouping, categories in structure.items():
@@ -222,8 +473,13 @@ class OSDRFilterGenerator:
         
         return structure
     
-    def initialize_from_existing(self):
-        """Initialize new JSON with ALL existing values"""
+    def initialize_from_existing(self, existing_structure):
+        """
+        Initialize new JSON with ALL existing values.
+        
+        The value sets are moved in rather than copied, so existing_structure
+        must not be used afterwards.
+        """
         new_json = {
             'Project Type': defaultdict(set),
             'Assay technology type': defaultdict(set),
@@ -233,27 +489,72 @@ class OSDRFilterGenerator:
             'Mission': defaultdict(set)
         }
         
-        # Copy everything from existing
-        for grouping, categories in self.existing_structure.items():
-            for category, values in categories.items():
-                new_json[grouping][category] = set(values)
+        # Take over everything from existing
+        for grouping, categories in existing_structure.items():
+            new_json[grouping].update(categories)
         
         return new_json
     
+    def build_value_index(self, existing_structure):
+        """Map each grouping's normalized existing values to their category"""
+        index = {grouping: {} for grouping in existing_structure}
+        for grouping, categories in existing_structure.items():
+            for category, values in categories.items():
+                for val in values:
+                    # First category wins, as in a scan of the structure
+                    index[grouping].setdefault(_norm(val), category)
+        return index
+    
     def find_category_for_value(self, value, grouping):
         """Find which category a value belongs to"""
-        norm_val = self.norm(value)
-        
-        # Check existing structure first
-        if grouping not in self.existing_structure:
-            return None
+        return self._value_to_category.get(grouping, {}).get(_norm(value))
+    
+    def merge_values(self, grouping, values, other_category):
+        """
+        Merge unique API values into a grouping.
         
-        for category, values in self.existing_structure[grouping].items():
-            for existing_val in values:
-                if self.norm(existing_val) == norm_val:
-                    return category
+        Args:
+            grouping: Grouping to merge into (e.g., "Organism")
+            values: dict mapping each unique value to the first OSD ID it was seen in
+            other_category: Category that receives values with no existing match
+        """
+        categories = self.new_json[grouping]
+        new_by_category = defaultdict(list)
+        for value, osd_id in values.items():
+            category = self.find_category_for_value(value, grouping)
+            if category:
+                # Check if this is actually new
+                if value not in categories[category]:
+                    new_by_category[category].append(value)
+            elif value not in categories[other_category]:
+                # Unmapped - add to "Other" category
+                categories[other_category].add(value)
+                self.unmapped[grouping].setdefault(value, []).append(osd_id)
         
-        return None
+        # Values are unique, so additions can be applied in bulk per category
+        for category, new_values in new_by_category.items():
+            categories[category].update(new_values)
+            self.additions[grouping][category].extend(new_values)
+    
+    def _process_single(self, data, col_name, grouping, other_category):
+        """Merge one API column, visiting each distinct value only once"""
+        col_idx = data['columns'].index(col_name)
+        values = {}
+        for row in data['data']:
+            value = row[col_idx]
+            if not value:
+                continue
+            self.all_osd_ids.add(row[0])
+            if value not in values:
+                values[value] = row[0]
+        self.merge_values(grouping, values, other_category)
+    
+    def categorize_mission(self, mission):
+        """Return the Mission category for a single mission identifier"""
+        for category, pattern in self._MISSION_RULES:
+            if pattern.search(mission):
+                return category
+        return 'Other Missions'
     
     def process_api_data(self):
         """Add new values from API data"""
@@ -261,87 +562,23 @@ class OSDRFilterGenerator:
         
         # Process Assays
         print("  Checking assay types...")
-        col_idx = self.assay_data['columns'].index('investigation.study assays.study assay technology type')
-        for row in self.assay_data['data']:
-            osd_id = row[0]
-            assay_type = row[col_idx]
-            
-            if not assay_type:
-                continue
-            
-            self.all_osd_ids.add(osd_id)
-            
-            category = self.find_category_for_value(assay_type, 'Assay technology type')
-            if category:
-                # Check if this is actually new
-                if assay_type not in self.new_json['Assay technology type'][category]:
-                    self.new_json['Assay technology type'][category].add(assay_type)
-                    self.additions.append(('Assay technology type', category, assay_type))
-            else:
-                # Unmapped - add to "Other" category
-                if assay_type not in self.new_json['Assay technology type']['Other Assay Types']:
-                    self.new_json['Assay technology type']['Other Assay Types'].add(assay_type)
-                    self.unmapped.append(('Assay technology type', assay_type, osd_id))
+        self._process_single(self.assay_data, 'investigation.study assays.study assay technology type',
+                             'Assay technology type', 'Other Assay Types')
         
         # Process Factors
         print("  Checking factors...")
         factor_cols = [col for col in self.factor_data['columns'] if 'factor value' in col.lower()]
-        for col in factor_cols:
-            factor_name = col.split('.')[-1]
-            
-            category = self.find_category_for_value(factor_name, 'Factor')
-            if category:
-                if factor_name not in self.new_json['Factor'][category]:
-                    self.new_json['Factor'][category].add(factor_name)
-                    self.additions.append(('Factor', category, factor_name))
-            else:
-                if factor_name not in self.new_json['Factor']['other']:
-                    self.new_json['Factor']['other'].add(factor_name)
-                    self.unmapped.append(('Factor', factor_name, 'schema'))
+        self.merge_values('Factor', {col.split('.')[-1]: 'schema' for col in factor_cols}, 'other')
         
         # Process Organisms
         print("  Checking organisms...")
-        col_idx = self.organism_data['columns'].index('study.characteristics.organism')
-        for row in self.organism_data['data']:
-            osd_id = row[0]
-            organism = row[col_idx]
-            
-            if not organism:
-                continue
-            
-            self.all_osd_ids.add(osd_id)
-            
-            category = self.find_category_for_value(organism, 'Organism')
-            if category:
-                if organism not in self.new_json['Organism'][category]:
-                    self.new_json['Organism'][category].add(organism)
-                    self.additions.append(('Organism', category, organism))
-            else:
-                if organism not in self.new_json['Organism']['Other Organisms']:
-                    self.new_json['Organism']['Other Organisms'].add(organism)
-                    self.unmapped.append(('Organism', organism, osd_id))
+        self._process_single(self.organism_data, 'study.characteristics.organism',
+                             'Organism', 'Other Organisms')
         
         # Process Materials
         print("  Checking material types...")
-        col_idx = self.material_data['columns'].index('study.characteristics.material type')
-        for row in self.material_data['data']:
-            osd_id = row[0]
-            material = row[col_idx]
-            
-            if not material:
-                continue
-            
-            self.all_osd_ids.add(osd_id)
-            
-            category = self.find_category_for_value(material, 'Material type')
-            if category:
-                if material not in self.new_json['Material type'][category]:
-                    self.new_json['Material type'][category].add(material)
-                    self.additions.append(('Material type', category, material))
-            else:
-                if material not in self.new_json['Material type']['Other Materials']:
-                    self.new_json['Material type']['Other Materials'].add(material)
-                    self.unmapped.append(('Material type', material, osd_id))
+        self._process_single(self.material_data, 'study.characteristics.material type',
+                             'Material type', 'Other Materials')
         
         # Process Missions (NEW grouping)
         print("  Processing missions (new grouping)...")
@@ -356,42 +593,15 @@ class OSDRFilterGenerator:
             self.all_osd_ids.add(osd_id)
             
             # Split by comma (some entries have multiple missions)
-            missions = [m.strip() for m in missions_str.split(',')]
+            missions = self._MISSION_SPLIT.split(missions_str.strip())
             
-            for mission in missions:
-                if not mission:
-                    continue
-                
-                # Categorize mission
-                mission_lower = self.norm(mission)
-                
-                if any(x in mission_lower for x in ['expedition', 'increment', 'iss']):
-                    category = 'ISS Expeditions'
-                elif any(x in mission_lower for x in ['sts-', 'sts ', 'shuttle', 'sls-']):
-                    category = 'Space Shuttle'
-                elif mission.startswith('RR-') or 'rodent research' in mission_lower:
-                    category = 'Rodent Research'
-                elif any(x in mission_lower for x in ['bion', 'cosmos']):
-                    category = 'Bion/Cosmos'
-                elif any(x in mission_lower for x in ['bric-', 'apex-', 'veg-', 'ffl', 'cbtm', 'cerise']):
-                    category = 'Payload Investigations'
-                elif any(x in mission_lower for x in ['ground', 'bsl', 'baseline']):
-                    category = 'Ground Control'
-                elif any(x in mission_lower for x in ['gamma_irradiation', 'heavy_ion', 'hze', 'proton_irradiation', 
-                                                      'x-ray_irradiation', 'irradiation', 'radiation']):
-                    category = 'Radiation Studies'
-                elif any(x in mission_lower for x in ['hindlimb_unloading', 'simulated_microgravity', 
-                                                       'simulated_hypergravity', 'simulated_environmental']):
-                    category = 'Simulated Conditions'
-                elif any(x in mission_lower for x in ['inspiration4', 'axiom', 'ax-', 'spacex']):
-                    category = 'Commercial Spaceflight'
-                else:
-                    category = 'Other Missions'
+            for mission in filter(None, missions):
+                category = self.categorize_mission(mission)
                 
                 if mission not in self.new_json['Mission'][category]:
                     self.new_json['Mission'][category].add(mission)
                     if category == 'Other Missions':
-                        self.unmapped.append(('Mission', mission, osd_id))
+                        self.unmapped['Mission'].setdefault(mission, []).append(osd_id)
     
     def verify_completeness(self):
         """Verify all original values are present in new JSON"""
@@ -399,27 +609,22 @@ class OSDRFilterGenerator:
         print("VERIFICATION: Checking completeness")
         print("="*80)
         
-        # Extract all values from original
-        original_values = set()
-        for grouping, categories in self.existing_structure.items():
-            for category, values in categories.items():
-                for val in values:
-                    original_values.add(self.norm(val))
+        # All original values, from the snapshot taken before merging
+        original_values = frozenset().union(*self._original_norm_by_group.values())
         
         # Extract all values from new (excluding Mission which is new)
-        new_values = set()
-        for grouping in ['Project Type', 'Assay technology type', 'Factor', 'Organism', 'Material type']:
-            if grouping not in self.new_json:
-                continue
-            for category, values in self.new_json[grouping].items():
-                for val in values:
-                    new_values.add(self.norm(val))
+        new_values = {
+            _norm(val)
+            for grouping in ['Project Type', 'Assay technology type', 'Factor', 'Organism', 'Material type']
+            for values in self.new_json[grouping].values()
+            for val in values
+        }
         
         missing = original_values - new_values
         
         print(f"\nOriginal values: {len(original_values)}")
         print(f"New values (excl. Mission): {len(new_values)}")
-        print(f"Values added from API: {len(self.additions)}")
+        print(f"Values added from API: {self.count_additions()}")
         print(f"Missing from new: {len(missing)}")
         
         if missing:
@@ -432,7 +637,7 @@ class OSDRFilterGenerator:
             return False
         else:
             print(f"\n✅ SUCCESS: All original values preserved!")
-            print(f"✅ PLUS: {len(self.additions)} new values added from API")
+            print(f"✅ PLUS: {self.count_additions()} new values added from API")
             
             # Show Mission summary
             mission_total = sum(len(v) for v in self.new_json['Mission'].values())
@@ -441,21 +646,23 @@ class OSDRFilterGenerator:
             
             return True
     
-    def generate_output_json(self):
-        """Generate final JSON structure"""
-        output = {}
-        
+    def count_additions(self):
+        """Total number of values added from the API"""
+        return sum(len(values) for categories in self.additions.values() for values in categories.values())
+    
+    def new_json_ordered_view(self):
+        """
+        Return the final JSON structure with groupings and categories in output
+        order. Values are left as sets and sorted by _SetEncoder while writing.
+        """
         # Order the groupings
         grouping_order = ['Project Type', 'Assay technology type', 'Factor', 'Organism', 'Material type', 'Mission']
         
-        for grouping in grouping_order:
-            if grouping not in self.new_json:
-                continue
-            output[grouping] = {}
-            for category, values in sorted(self.new_json[grouping].items()):
-                output[grouping][category] = sorted(list(values))
-        
-        return output
+        return {
+            grouping: dict(sorted(self.new_json[grouping].items()))
+            for grouping in grouping_order
+            if grouping in self.new_json
+        }
     
     def save_outputs(self, output_dir=None):
         """Save all output files"""
@@ -467,75 +674,64 @@ class OSDRFilterGenerator:
             # Default to current working directory (which should be writable)
             output_dir = os.getcwd()
         
-        # Generate output JSON
-        output_json = self.generate_output_json()
-        
         # Save new filter-options JSON
         output_path = os.path.join(output_dir, 'filter-options-new.json')
-        with open(output_path, 'w') as f:
-            json.dump(output_json, f, indent=2)
+        # json.dump emits many small chunks; a large buffer batches them into few writes
+        with open(output_path, 'w', buffering=1 << 20) as f:
+            json.dump(self.new_json_ordered_view(), f, cls=_SetEncoder, indent=2)
         print(f"\n✓ New JSON: {output_path}")
         
-        # Save additions report
+        # Save additions report (assembled in memory and written in one call)
+        parts = [
+            "ADDITIONS REPORT\n",
+            "="*80 + "\n",
+            f"\nTotal new values added: {self.count_additions()}\n",
+            "="*80 + "\n\n",
+        ]
+        if self.additions:
+            for grouping in sorted(self.additions.keys()):
+                parts.append(f"\n{grouping}:\n")
+                parts.append("-"*80 + "\n")
+                for category in sorted(self.additions[grouping].keys()):
+                    parts.append(f"\n  {category}:\n")
+                    parts.extend(f"    + {val}\n" for val in sorted(self.additions[grouping][category]))
+        else:
+            parts.append("No new values added.\n")
+        
         additions_path = os.path.join(output_dir, 'additions-report.txt')
         with open(additions_path, 'w') as f:
-            f.write("ADDITIONS REPORT\n")
-            f.write("="*80 + "\n")
-            f.write(f"\nTotal new values added: {len(self.additions)}\n")
-            f.write("="*80 + "\n\n")
-            
-            if self.additions:
-                by_group = defaultdict(lambda: defaultdict(list))
-                for grouping, category, value in self.additions:
-                    by_group[grouping][category].append(value)
-                
-                for grouping in sorted(by_group.keys()):
-                    f.write(f"\n{grouping}:\n")
-                    f.write("-"*80 + "\n")
-                    for category in sorted(by_group[grouping].keys()):
-                        f.write(f"\n  {category}:\n")
-                        for val in sorted(by_group[grouping][category]):
-                            f.write(f"    + {val}\n")
-            else:
-                f.write("No new values added.\n")
+            f.write(''.join(parts))
         print(f"✓ Additions report: {additions_path}")
         
         # Save unmapped report
+        parts = [
+            "UNMAPPED ITEMS REPORT\n",
+            "="*80 + "\n",
+            "\nThese items from the API do not fit into existing categories.\n",
+            "They have been placed in 'Other' categories and may need\n",
+            "manual review to determine appropriate subcategories.\n",
+            "="*80 + "\n\n",
+        ]
+        if self.unmapped:
+            for grouping in sorted(self.unmapped.keys()):
+                parts.append(f"\n{grouping}:\n")
+                parts.append("-"*80 + "\n")
+                
+                unique_unmapped = self.unmapped[grouping]
+                for val in sorted(unique_unmapped.keys()):
+                    osd_list = ', '.join(unique_unmapped[val][:5])
+                    more = len(unique_unmapped[val]) - 5
+                    parts.append(f"\n  {val}\n")
+                    parts.append(f"    Found in: {osd_list}")
+                    if more > 0:
+                        parts.append(f" and {more} more")
+                    parts.append("\n")
+        else:
+            parts.append("All items successfully categorized.\n")
+        
         unmapped_path = os.path.join(output_dir, 'unmapped-report.txt')
         with open(unmapped_path, 'w') as f:
-            f.write("UNMAPPED ITEMS REPORT\n")
-            f.write("="*80 + "\n")
-            f.write("\nThese items from the API do not fit into existing categories.\n")
-            f.write("They have been placed in 'Other' categories and may need\n")
-            f.write("manual review to determine appropriate subcategories.\n")
-            f.write("="*80 + "\n\n")
-            
-            if self.unmapped:
-                by_group = defaultdict(list)
-                for grouping, value, osd_id in self.unmapped:
-                    by_group[grouping].append((value, osd_id))
-                
-                for grouping in sorted(by_group.keys()):
-                    f.write(f"\n{grouping}:\n")
-                    f.write("-"*80 + "\n")
-                    
-                    # Group by unique value
-                    unique_unmapped = {}
-                    for val, osd_id in by_group[grouping]:
-                        if val not in unique_unmapped:
-                            unique_unmapped[val] = []
-                        unique_unmapped[val].append(osd_id)
-                    
-                    for val in sorted(unique_unmapped.keys()):
-                        osd_list = ', '.join(unique_unmapped[val][:5])
-                        more = len(unique_unmapped[val]) - 5
-                        f.write(f"\n  {val}\n")
-                        f.write(f"    Found in: {osd_list}")
-                        if more > 0:
-                            f.write(f" and {more} more")
-                        f.write("\n")
-            else:
-                f.write("All items successfully categorized.\n")
+            f.write(''.join(parts))
         print(f"✓ Unmapped report: {unmapped_path}")
         
         return output_path, additions_path, unmapped_path
@@ -564,14 +760,20 @@ class OSDRFilterGenerator:
 
 def main():
     """Main entry point"""
-    if len(sys.argv) > 1:
+    parser = argparse.ArgumentParser(description="Regenerate OSDR filter-options JSON from the OSDR API")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore cached API responses, download everything again "
+                             "and refresh the cache")
+    args, extra = parser.parse_known_args()
+    
+    if extra:
         print("Note: This script no longer requires input files.")
         print("It will automatically download the current filter-options from OSDR.")
-        print("\nUsage: python3 osdr_generator.py")
+        print("\nUsage: python3 osdr_generator.py [--no-cache]")
         print("\nProceeding with automatic download...\n")
     
     try:
-        generator = OSDRFilterGenerator()
+        generator = OSDRFilterGenerator(use_cache=not args.no_cache)
         success = generator.run()
         sys.exit(0 if success else 1)
     except Exception as e: